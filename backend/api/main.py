@@ -1,16 +1,40 @@
 # main.py
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from typing import List
+from urllib.parse import quote
+import anyio
+import asyncio
+import logging
 import os
+import json
+import re
+import tempfile
+import threading
+import unicodedata
 from dotenv import load_dotenv
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
-from scraper.places_scraper import RestaurantScraper
+from scraper.places_scraper import RestaurantScraper, DEFAULT_CACHE_PATH
+from scraper.jobs import JobManager, FINISHED_STATUSES
+from scraper.export import EXPORT_FORMATS, MEDIA_TYPES, iter_csv, iter_jsonl, write_parquet
 
 load_dotenv()
 
+# Per-stage timings are logged as JSON lines, uvicorn leaves the root logger at WARNING
+metrics_handler = logging.StreamHandler()
+metrics_handler.setFormatter(logging.Formatter('%(message)s'))
+metrics_logger = logging.getLogger('scraper.metrics')
+metrics_logger.addHandler(metrics_handler)
+metrics_logger.setLevel(os.getenv('SCRAPER_METRICS_LOG_LEVEL', 'INFO').upper())
+metrics_logger.propagate = False
+
 app = FastAPI()
 
 app.add_middleware(
@@ -21,20 +45,203 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Sync handlers and streams run on a threadpool of 40, bulk jobs add their own workers
+API_THREADS = 40
+JOB_PLACE_WORKERS = 8
+
 api_key = os.getenv('GOOGLE_PLACES_API_KEY')
-scraper = RestaurantScraper(api_key)
+scraper = RestaurantScraper(api_key, cache_path=os.getenv('SCRAPER_CACHE_PATH'),
+                            caller_threads=API_THREADS + JOB_PLACE_WORKERS)
+jobs = JobManager(scraper, os.getenv('SCRAPER_JOBS_PATH') or DEFAULT_CACHE_PATH.with_name('jobs.sqlite3'),
+                  place_workers=JOB_PLACE_WORKERS)
+
+class JobRequest(BaseModel):
+    locations: List[str]
+
+async def iterate_off_loop(iterator, cancelled: threading.Event):
+    """Pull items from a blocking iterator in the threadpool, cancelling it when the client goes away."""
+    try:
+        while True:
+            # Abandoning the worker on cancel lets a disconnect reach the finally below
+            # straight away instead of after the next restaurant finishes enriching
+            item = await anyio.to_thread.run_sync(next, iterator, None, abandon_on_cancel=True)
+            if item is None:
+                break
+            yield item
+    finally:
+        # Runs on client disconnect too, stopping the crawl behind this stream
+        cancelled.set()
+
+def attachment_header(filename: str) -> str:
+    """Content-Disposition with an ASCII fallback name plus the UTF-8 one (RFC 5987)."""
+    stem, _, extension = filename.rpartition(".")
+    ascii_stem = unicodedata.normalize("NFKD", stem).encode("ascii", "ignore").decode("ascii")
+    ascii_stem = re.sub(r"[^A-Za-z0-9_-]+", "-", ascii_stem).strip("-") or "restaurants"
+    return f"attachment; filename=\"{ascii_stem}.{extension}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+@app.on_event("startup")
+def resume_jobs():
+    jobs.resume()
 
 @app.get("/")
 def read_root():
     return {"message": "Restaurant Finder API"}
 
+# Sync handler so FastAPI runs the crawl in its threadpool instead of on the event loop
 @app.get("/api/restaurants")
-async def search_restaurants(location: str):
+def search_restaurants(location: str, mode: str = "full", pages: int = Query(1, ge=1, le=3)):
     if not location:
         raise HTTPException(status_code=400, detail="Location parameter is required")
+    if mode not in ("full", "summary"):
+        raise HTTPException(status_code=400, detail="Mode must be 'full' or 'summary'")
     
     try:
+        if mode == "summary":
+            return scraper.search_summary(location, max_pages=pages)
         results = scraper.search_restaurants(location)
         return results
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/restaurants/tiled")
+def search_restaurants_tiled(location: str = None, bounds: str = None,
+                             grid: int = Query(3, ge=1, le=5), max_depth: int = Query(2, ge=0, le=3)):
+    if not location and not bounds:
+        raise HTTPException(status_code=400, detail="Location or bounds parameter is required")
+    
+    try:
+        box = tuple(float(value) for value in bounds.split(",")) if bounds else None
+    except ValueError:
+        box = ()
+    if box is not None and len(box) != 4:
+        raise HTTPException(status_code=400, detail="Bounds must be south,west,north,east")
+    
+    try:
+        return scraper.search_restaurants_tiled(location, bounds=box, grid_size=grid, max_depth=max_depth)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/restaurants/export")
+async def export_restaurants(location: str, format: str = "csv"):
+    if not location:
+        raise HTTPException(status_code=400, detail="Location parameter is required")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of {', '.join(EXPORT_FORMATS)}")
+    
+    filename = f"restaurants-{location}.{format}"
+    if format == "parquet":
+        # Parquet needs its footer written last, so it is built in a temp file first
+        handle, path = tempfile.mkstemp(suffix=".parquet")
+        os.close(handle)
+        try:
+            await run_in_threadpool(write_parquet, scraper.iter_records(location), path)
+        except RuntimeError as e:
+            os.remove(path)
+            raise HTTPException(status_code=501, detail=str(e))
+        return FileResponse(path, media_type=MEDIA_TYPES[format],
+                            headers={"Content-Disposition": attachment_header(filename)},
+                            background=BackgroundTask(os.remove, path))
+
+    cancelled = threading.Event()
+    records = scraper.iter_records(location, cancelled=cancelled)
+    chunks = iter_csv(records) if format == "csv" else iter_jsonl(records)
+    return StreamingResponse(
+        iterate_off_loop(chunks, cancelled),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": attachment_header(filename)},
+    )
+
+@app.get("/api/restaurants/stream")
+async def stream_restaurants(location: str, format: str = "ndjson"):
+    if not location:
+        raise HTTPException(status_code=400, detail="Location parameter is required")
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'sse'")
+
+    async def events():
+        cancelled = threading.Event()
+        restaurants = scraper.iter_restaurants(location, cancelled=cancelled)
+        async for restaurant in iterate_off_loop(restaurants, cancelled):
+            if format == "sse":
+                yield f"data: {json.dumps(restaurant)}\n\n"
+            else:
+                yield json.dumps(restaurant) + "\n"
+        if format == "sse":
+            yield "event: done\ndata: {}\n\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type)
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    return scraper.cache.stats()
+
+@app.get("/metrics")
+def metrics():
+    return {"stages": scraper.metrics.snapshot(), "cache": scraper.cache.stats()}
+
+@app.post("/api/jobs")
+def create_job(request: JobRequest):
+    locations = [location.strip() for location in request.locations if location.strip()]
+    if not locations:
+        raise HTTPException(status_code=400, detail="At least one location is required")
+    
+    job_id = jobs.submit(locations)
+    return jobs.progress(job_id)
+
+@app.get("/api/jobs/{job_id}")
+def job_progress(job_id: str):
+    progress = jobs.progress(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return progress
+
+@app.post("/api/jobs/{job_id}/resume")
+def resume_job(job_id: str):
+    progress = jobs.progress(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not jobs.retry(job_id):
+        raise HTTPException(status_code=409, detail="Only failed jobs can be resumed")
+    return jobs.progress(job_id)
+
+@app.get("/api/jobs/{job_id}/stream")
+async def stream_job_progress(job_id: str):
+    if await run_in_threadpool(jobs.progress, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last = None
+        while True:
+            progress = await run_in_threadpool(jobs.progress, job_id)
+            if progress != last:
+                yield json.dumps(progress) + "\n"
+                last = progress
+            if progress["status"] in FINISHED_STATUSES:
+                break
+            await asyncio.sleep(1)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/api/jobs/{job_id}/results")
+def job_results(job_id: str):
+    progress = jobs.progress(job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if progress["status"] not in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail="Job is still running")
+    return {**progress, "results": jobs.results(job_id)}
+
+@app.get("/api/restaurants/{place_id}")
+def restaurant_details(place_id: str, fields: str = "ratings,contact,hours,reviews,email"):
+    groups = [group.strip() for group in fields.split(",") if group.strip()]
+    try:
+        restaurant = scraper.get_place(place_id, groups)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if restaurant is None:
+        raise HTTPException(status_code=404, detail="Place not found")
+    return restaurant
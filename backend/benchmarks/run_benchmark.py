@@ -0,0 +1,114 @@
+"""End-to-end scraper benchmark against the local stand-in server.
+
+Runs a set of searches for distinct synthetic towns and reports throughput,
+p50/p95/p99 search latency, memory and the scraper's own per-stage timings.
+Peak traced memory comes from a separate pass (--trace-memory) so tracing
+never slows the timed run.
+
+    python benchmarks/run_benchmark.py --searches 20 --concurrency 4
+"""
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+from scraper.places_scraper import RestaurantScraper
+from scraper.metrics import summarise
+from standin_server import StandInServer, add_config_arguments, config_from_args
+
+# ru_maxrss is in bytes on macOS and kilobytes on Linux
+RSS_UNITS_PER_MB = 1024 * 1024 if sys.platform == 'darwin' else 1024
+
+MODES = {
+    'full': lambda scraper, location: scraper.search_restaurants(location),
+    'stream': lambda scraper, location: list(scraper.iter_restaurants(location)),
+    'summary': lambda scraper, location: scraper.search_summary(location),
+}
+
+
+def run(args) -> dict:
+    server = StandInServer(config_from_args(args)).start()
+    cache_dir = tempfile.TemporaryDirectory()
+    scraper = RestaurantScraper(
+        'benchmark',
+        max_workers=args.workers,
+        places_rate=args.places_rate,
+        website_rate=0,
+        cache_path=str(Path(cache_dir.name) / 'cache.sqlite3'),
+        api_base_url=server.url,
+        page_token_delay=args.page_delay,
+        caller_threads=args.concurrency,
+    )
+    # Synthetic restaurant sites live on *.bench.test hosts served by the stand-in
+    scraper.http.session.proxies.update({'http': server.url})
+    search = MODES[args.mode]
+
+    def timed_search(location):
+        start = time.perf_counter()
+        found = len(search(scraper, location))
+        return time.perf_counter() - start, found
+
+    def run_searches(locations):
+        if args.warm:
+            for location in locations:
+                search(scraper, location)
+        scraper.metrics.reset()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            outcomes = list(pool.map(timed_search, locations))
+        return outcomes, time.perf_counter() - start
+
+    # Timed without tracemalloc, its allocation hooks would slow every search
+    outcomes, wall = run_searches([f"Bench Town {index}" for index in range(args.searches)])
+    stages = scraper.metrics.snapshot()
+
+    latencies = [latency for latency, _ in outcomes]
+    restaurants = sum(found for _, found in outcomes)
+    report = {
+        'mode': args.mode,
+        'searches': len(outcomes),
+        'restaurants': restaurants,
+        'wall_seconds': round(wall, 3),
+        'searches_per_second': round(len(outcomes) / wall, 3),
+        'restaurants_per_second': round(restaurants / wall, 2),
+        'search_latency': summarise(latencies),
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / RSS_UNITS_PER_MB, 2),
+        'stages': stages,
+        'cache': scraper.cache.stats(),
+    }
+
+    if args.trace_memory:
+        # A separate pass over fresh towns, only its peak memory is reported
+        tracemalloc.start()
+        run_searches([f"Bench Trace Town {index}" for index in range(args.searches)])
+        _, peak_traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report['peak_traced_mb'] = round(peak_traced / 1024 / 1024, 2)
+
+    server.stop()
+    scraper.cache.close()
+    cache_dir.cleanup()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=sorted(MODES), default='full')
+    parser.add_argument('--searches', type=int, default=10, help='distinct towns to search')
+    parser.add_argument('--concurrency', type=int, default=1, help='searches run at the same time')
+    parser.add_argument('--workers', type=int, default=8, help='RestaurantScraper max_workers')
+    parser.add_argument('--places-rate', type=float, default=100.0, help='Places requests per second')
+    parser.add_argument('--page-delay', type=float, default=0.1, help='delay before using a next_page_token')
+    parser.add_argument('--warm', action='store_true', help='run every search once first so the cache is hot')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='add an untimed pass under tracemalloc to report peak traced memory')
+    add_config_arguments(parser)
+
+    print(json.dumps(run(parser.parse_args()), indent=2))
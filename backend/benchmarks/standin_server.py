@@ -0,0 +1,249 @@
+"""Local stand-in for the Google Places endpoints and restaurant websites.
+
+Serves Text Search (with page tokens), Place Details and Geocoding responses
+plus synthetic restaurant sites, with configurable latency, page size and
+failure rate, so the scraper can be benchmarked without spending quota.
+Each website gets its own ``*.bench.test`` host; point the scraper's HTTP
+proxy at this server so those hosts resolve here.
+
+    python benchmarks/standin_server.py --port 8765 --site-latency 0.2
+"""
+import argparse
+import base64
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 20
+SITE_DOMAIN = '.bench.test'
+REVIEW_TEXTS = [
+    "Great food and friendly staff, will be back",
+    "Delivery was late and the meal was cold",
+    "Good value for money, the menu has loads of choice",
+    "Dirty tables but the taste made up for it",
+    "Service was slow and the prices are expensive",
+    "Best kebab in town, ordered via Just Eat",
+    "Lovely clean restaurant, the waiter was very helpful",
+    "Cheap and cheerful, nothing special",
+]
+CUISINES = ['indian', 'chinese', 'pizza', 'kebab', 'thai', 'cafe', 'fish_and_chips', 'burger']
+
+
+@dataclass
+class StandInConfig:
+    places_per_query: int = 60
+    api_latency: float = 0.05
+    site_latency: float = 0.1
+    site_bytes: int = 50000
+    failure_rate: float = 0.05
+    website_ratio: float = 0.8
+
+
+def _rng(key: str) -> random.Random:
+    return random.Random(zlib.crc32(key.encode('utf-8')))
+
+
+def _encode_token(query: str, page: int) -> str:
+    return base64.urlsafe_b64encode(f"{page}|{query}".encode('utf-8')).decode('ascii')
+
+
+def _decode_token(token: str):
+    page, query = base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8').split('|', 1)
+    return query, int(page)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def config(self) -> StandInConfig:
+        return self.server.config
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        # Proxied requests carry an absolute URL, direct ones only a path
+        url = urlparse(self.path)
+        host = (url.netloc or self.headers.get('Host', '')).split(':')[0]
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if host.endswith(SITE_DOMAIN):
+            self._site(host[:-len(SITE_DOMAIN)], url.path)
+        elif url.path == '/maps/api/place/textsearch/json':
+            time.sleep(self.config.api_latency)
+            self._send_json(self._text_search(params))
+        elif url.path == '/maps/api/place/details/json':
+            time.sleep(self.config.api_latency)
+            self._send_json(self._details(params.get('place_id', '')))
+        elif url.path == '/maps/api/geocode/json':
+            time.sleep(self.config.api_latency)
+            self._send_json(self._geocode(params.get('address', '')))
+        else:
+            self._send(404, b'not found', 'text/plain')
+
+    def _text_search(self, params):
+        if 'pagetoken' in params:
+            query, page = _decode_token(params['pagetoken'])
+        else:
+            query, page = f"{params.get('query', '')}|{params.get('location', '')}", 0
+
+        rng = _rng(query)
+        lat, lng = 51.5 + rng.uniform(-0.05, 0.05), -0.1 + rng.uniform(-0.05, 0.05)
+        if params.get('location'):
+            lat, lng = map(float, params['location'].split(','))
+
+        start = page * PAGE_SIZE
+        end = min(start + PAGE_SIZE, self.config.places_per_query)
+        results = []
+        for index in range(start, end):
+            place_id = f"bench-{zlib.crc32(query.encode('utf-8')):08x}-{index}"
+            place_rng = _rng(place_id)
+            results.append({
+                'place_id': place_id,
+                'name': f"Restaurant {index}",
+                'formatted_address': f"{index} High Street",
+                'rating': round(place_rng.uniform(3, 5), 1),
+                'user_ratings_total': place_rng.randint(5, 500),
+                'price_level': place_rng.randint(1, 3),
+                'geometry': {'location': {
+                    'lat': lat + place_rng.uniform(-0.005, 0.005),
+                    'lng': lng + place_rng.uniform(-0.005, 0.005),
+                }},
+            })
+
+        response = {'status': 'OK' if results else 'ZERO_RESULTS', 'results': results}
+        if end < self.config.places_per_query:
+            response['next_page_token'] = _encode_token(query, page + 1)
+        return response
+
+    def _details(self, place_id: str):
+        rng = _rng(place_id)
+        result = {
+            'name': f"Restaurant {place_id}",
+            'formatted_phone_number': f"020 {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}",
+            'formatted_address': f"{rng.randint(1, 200)} High Street",
+            'opening_hours': {'weekday_text': [f"{day}: 11:00 AM – 10:00 PM" for day in
+                                               ('Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                                                'Friday', 'Saturday', 'Sunday')]},
+            'price_level': rng.randint(1, 3),
+            'rating': round(rng.uniform(3, 5), 1),
+            'user_ratings_total': rng.randint(5, 500),
+            'types': ['restaurant', rng.choice(CUISINES), 'food', 'establishment'],
+            'reviews': [
+                {'text': rng.choice(REVIEW_TEXTS), 'rating': rng.randint(1, 5), 'time': rng.randint(1600000000, 1700000000)}
+                for _ in range(5)
+            ],
+        }
+        if rng.random() < self.config.website_ratio:
+            result['website'] = f"http://{place_id}{SITE_DOMAIN}/"
+        return {'status': 'OK', 'result': result}
+
+    def _geocode(self, address: str):
+        rng = _rng(address)
+        lat, lng = 51.5 + rng.uniform(-0.2, 0.2), -0.1 + rng.uniform(-0.2, 0.2)
+        return {'status': 'OK', 'results': [{'geometry': {'viewport': {
+            'southwest': {'lat': lat - 0.03, 'lng': lng - 0.05},
+            'northeast': {'lat': lat + 0.03, 'lng': lng + 0.05},
+        }}}]}
+
+    def _site(self, place_id: str, path: str):
+        time.sleep(self.config.site_latency)
+        if random.random() < self.config.failure_rate:
+            self._send(500, b'server error', 'text/plain')
+            return
+
+        rng = _rng(place_id)
+        email = f"info@{place_id}.co.uk"
+        on_homepage = rng.random() < 0.5
+
+        if path.rstrip('/') == '/contact':
+            body = f'<p>Email us at <a href="mailto:{email}">{email}</a></p>'
+        elif on_homepage:
+            body = f'<footer>Contact: {email}</footer>'
+        else:
+            body = '<nav><a href="/contact">Contact us</a></nav>'
+
+        filler = '<p>' + 'Fresh food cooked to order. ' * 40 + '</p>'
+        repeat = max(0, self.config.site_bytes // len(filler))
+        html = f'<html><head><title>{place_id}</title></head><body>{filler * repeat}{body}</body></html>'
+        self._send(200, html.encode('utf-8'), 'text/html; charset=utf-8')
+
+    def _send_json(self, data):
+        self._send(200, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The scraper drops connections it has read enough of, that's expected here
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StandInServer:
+    def __init__(self, config: StandInConfig, host: str = '127.0.0.1', port: int = 0):
+        self.httpd = QuietHTTPServer((host, port), StandInHandler)
+        self.httpd.config = config
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='standin-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--places', type=int, default=60, help='places returned per text search')
+    parser.add_argument('--api-latency', type=float, default=0.05, help='seconds per Places API call')
+    parser.add_argument('--site-latency', type=float, default=0.1, help='seconds per website page')
+    parser.add_argument('--site-bytes', type=int, default=50000, help='approximate website page size')
+    parser.add_argument('--failure-rate', type=float, default=0.05, help='share of website requests that fail')
+
+
+def config_from_args(args) -> StandInConfig:
+    return StandInConfig(
+        places_per_query=args.places,
+        api_latency=args.api_latency,
+        site_latency=args.site_latency,
+        site_bytes=args.site_bytes,
+        failure_rate=args.failure_rate,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = StandInServer(config_from_args(args), args.host, args.port)
+    print(f"Stand-in Places API listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
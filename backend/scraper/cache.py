@@ -0,0 +1,175 @@
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Seconds an entry is considered fresh, per layer
+DEFAULT_TTLS = {
+    'search': 6 * 3600,
+    'details': 24 * 3600,
+    'email': 30 * 24 * 3600,
+}
+
+DEFAULT_MAX_ENTRIES = {
+    'search': 2000,
+    'details': 50000,
+    'email': 50000,
+}
+
+# Empty values (e.g. no email on a site) are re-checked sooner than real ones
+DEFAULT_EMPTY_TTL = 24 * 3600
+EMPTY_VALUES = ('""', '[]', '{}')
+
+# How long past its TTL an entry may still be served while it is refreshed
+DEFAULT_MAX_STALE = 7 * 24 * 3600
+
+REFRESH_WORKERS = 2
+
+
+def normalise_location(location: str) -> str:
+    return ' '.join(location.lower().replace(',', ' ').split())
+
+
+class PlaceCache:
+    """SQLite backed cache with per-layer TTLs, LRU eviction and stale-while-revalidate."""
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, int]] = None,
+                 max_entries: Optional[Dict[str, int]] = None,
+                 stale_while_revalidate: bool = True, max_stale: int = DEFAULT_MAX_STALE,
+                 empty_ttl: int = DEFAULT_EMPTY_TTL):
+        self.path = str(path)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = {**DEFAULT_MAX_ENTRIES, **(max_entries or {})}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale
+        self.empty_ttl = empty_ttl
+
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' layer TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,'
+            ' stored_at REAL NOT NULL, accessed_at REAL NOT NULL,'
+            ' PRIMARY KEY (layer, key))'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS entries_lru ON entries (layer, accessed_at)')
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='cache-refresh')
+        self._stats = {
+            layer: {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'evictions': 0}
+            for layer in self.ttls
+        }
+
+    def get(self, layer: str, key: str, refresh: Optional[Callable[[], Any]] = None) -> Any:
+        """Return the cached value or None. Stale values are returned only when
+        a refresh callable is given, which is then run in the background."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, stored_at FROM entries WHERE layer = ? AND key = ?', (layer, key)
+            ).fetchone()
+            if row is None:
+                self._count(layer, 'misses')
+                return None
+
+            age = now - row[1]
+            ttl = self.ttls.get(layer, 0)
+            if row[0] in EMPTY_VALUES:
+                ttl = min(ttl, self.empty_ttl)
+            if age <= ttl:
+                self._count(layer, 'hits')
+            elif refresh is not None and self.stale_while_revalidate and age <= ttl + self.max_stale:
+                self._count(layer, 'stale_hits')
+            else:
+                self._count(layer, 'misses')
+                return None
+
+            self._conn.execute(
+                'UPDATE entries SET accessed_at = ? WHERE layer = ? AND key = ?', (now, layer, key)
+            )
+            self._conn.commit()
+
+        if age > ttl:
+            self._schedule_refresh(layer, key, refresh)
+        return json.loads(row[0])
+
+    def set(self, layer: str, key: str, value: Any):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (layer, key, value, stored_at, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (layer, key, json.dumps(value), now, now)
+            )
+            self._evict(layer)
+            self._conn.commit()
+
+    def get_or_fetch(self, layer: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """Return the cached value or fetch and store it. A fetch that returns
+        None or raises is not cached, empty values are kept for ``empty_ttl``."""
+        value = self.get(layer, key, refresh=fetch)
+        if value is None:
+            value = fetch()
+            if value is not None:
+                self.set(layer, key, value)
+        return value
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            sizes = dict(self._conn.execute('SELECT layer, COUNT(*) FROM entries GROUP BY layer').fetchall())
+            return {
+                layer: {**counters, 'size': sizes.get(layer, 0)}
+                for layer, counters in self._stats.items()
+            }
+
+    def close(self):
+        self._refresher.shutdown(wait=False)
+        with self._lock:
+            self._conn.close()
+
+    def _count(self, layer: str, counter: str, amount: int = 1):
+        self._stats.setdefault(
+            layer, {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'evictions': 0}
+        )[counter] += amount
+
+    def _evict(self, layer: str):
+        limit = self.max_entries.get(layer)
+        if not limit:
+            return
+        size = self._conn.execute('SELECT COUNT(*) FROM entries WHERE layer = ?', (layer,)).fetchone()[0]
+        if size <= limit:
+            return
+        self._conn.execute(
+            'DELETE FROM entries WHERE layer = ? AND key IN ('
+            ' SELECT key FROM entries WHERE layer = ? ORDER BY accessed_at LIMIT ?)',
+            (layer, layer, size - limit)
+        )
+        self._count(layer, 'evictions', size - limit)
+
+    def _schedule_refresh(self, layer: str, key: str, refresh: Callable[[], Any]):
+        with self._lock:
+            if (layer, key) in self._refreshing:
+                return
+            self._refreshing.add((layer, key))
+        self._refresher.submit(self._refresh, layer, key, refresh)
+
+    def _refresh(self, layer: str, key: str, refresh: Callable[[], Any]):
+        try:
+            value = refresh()
+            if value is not None:
+                self.set(layer, key, value)
+                with self._lock:
+                    self._count(layer, 'refreshes')
+        except Exception as e:
+            print(f"Error refreshing cache entry {layer}/{key}: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard((layer, key))
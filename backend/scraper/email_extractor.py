@@ -0,0 +1,160 @@
+import re
+import threading
+from concurrent.futures import Future
+from typing import Iterator, List, Tuple
+from urllib.parse import unquote, urljoin, urlparse
+
+from scraper.http_client import HttpClient
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Patterns run straight over the raw response bytes, no DOM parse needed
+EMAIL_RE = re.compile(rb'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+MAILTO_RE = re.compile(rb'mailto:([^"\'<>\s]+)', re.IGNORECASE)
+CFEMAIL_RE = re.compile(rb'data-cfemail=["\']([0-9a-fA-F]+)["\']|/cdn-cgi/l/email-protection#([0-9a-fA-F]+)')
+ENCODED_AT_RE = re.compile(rb'&#0*64;|&#x0*40;|%40', re.IGNORECASE)
+LINK_RE = re.compile(rb'<a\s[^>]*?href=["\']([^"\'#]+)["\'][^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+CONTACT_HINT_RE = re.compile(rb'contact|about|get-in-touch|find-us|enquir|reach-us', re.IGNORECASE)
+
+EXCLUDED_FRAGMENTS = ('example', 'domain', 'email', '@your', '@site')
+EXCLUDED_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg')
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+
+class PageUnavailable(Exception):
+    """A page answered with an error status or something other than HTML."""
+
+
+def site_domain(url: str) -> str:
+    return urlparse(url).netloc.lower().split(':')[0].removeprefix('www.')
+
+
+def decode_cfemail(encoded: str) -> str:
+    """Decode a Cloudflare email-protection hex string (first byte is the XOR key)."""
+    data = bytes.fromhex(encoded)
+    return bytes(b ^ data[0] for b in data[1:]).decode('utf-8', errors='ignore')
+
+
+def is_valid_email(email: str) -> bool:
+    lowered = email.lower()
+    return not (any(exclude in lowered for exclude in EXCLUDED_FRAGMENTS)
+                or lowered.endswith(EXCLUDED_SUFFIXES))
+
+
+def extract_emails(body: bytes) -> List[str]:
+    """Return valid emails in a page, mailto and de-obfuscated ones first."""
+    found = []
+
+    for match in MAILTO_RE.finditer(body):
+        address = unquote(match.group(1).decode('utf-8', errors='ignore')).split('?')[0]
+        found.append(address.strip())
+
+    for match in CFEMAIL_RE.finditer(body):
+        try:
+            found.append(decode_cfemail((match.group(1) or match.group(2)).decode('ascii')))
+        except ValueError:
+            continue
+
+    for match in EMAIL_RE.finditer(ENCODED_AT_RE.sub(b'@', body)):
+        found.append(match.group(0).decode('ascii'))
+
+    emails = []
+    for email in found:
+        if EMAIL_RE.fullmatch(email.encode('utf-8', errors='ignore')) and is_valid_email(email) and email not in emails:
+            emails.append(email)
+    return emails
+
+
+def contact_links(body: bytes, base_url: str) -> Iterator[str]:
+    domain = site_domain(base_url)
+    for match in LINK_RE.finditer(body):
+        href, text = match.group(1), match.group(2)
+        if not (CONTACT_HINT_RE.search(href) or CONTACT_HINT_RE.search(text)):
+            continue
+        url = urljoin(base_url, href.decode('utf-8', errors='ignore').strip())
+        if url.startswith(('http://', 'https://')) and site_domain(url) == domain:
+            yield url
+
+
+class EmailExtractor:
+    """Finds a contact email for a restaurant website.
+
+    Pages are streamed with a byte cap and scanned with precompiled patterns.
+    When the homepage has no address, a few contact/about pages on the same
+    domain are tried. Concurrent lookups for one domain share a single crawl.
+    """
+
+    def __init__(self, http: HttpClient, max_bytes: int = 512 * 1024, max_pages: int = 3, timeout: int = 10):
+        self.http = http
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def extract(self, url: str) -> str:
+        domain = site_domain(url) or url
+        with self._lock:
+            future = self._inflight.get(domain)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[domain] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            email = self._crawl(url)
+            future.set_result(email)
+            return email
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(domain, None)
+
+    def _crawl(self, url: str) -> str:
+        # A homepage that can't be fetched raises, so callers don't cache it as "no email"
+        final_url, body = self._fetch(url)
+
+        emails = extract_emails(body)
+        if emails:
+            return emails[0]
+
+        visited = {url, final_url}
+        fetched = 1
+        for link in contact_links(body, final_url):
+            if fetched >= self.max_pages:
+                break
+            if link in visited:
+                continue
+            visited.add(link)
+            fetched += 1
+            try:
+                page = self._fetch(link)
+            except Exception:
+                continue
+            emails = extract_emails(page[1])
+            if emails:
+                return emails[0]
+        return ''
+
+    def _fetch(self, url: str) -> Tuple[str, bytes]:
+        headers = {'User-Agent': USER_AGENT}
+        with self.http.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code >= 400:
+                raise PageUnavailable(f"{url} returned HTTP {response.status_code}")
+            content_type = response.headers.get('Content-Type', 'text/html').lower()
+            if not content_type.startswith(HTML_CONTENT_TYPES):
+                raise PageUnavailable(f"{url} is not an HTML page ({content_type})")
+
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=16384):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.max_bytes:
+                    break
+            return response.url, b''.join(chunks)[:self.max_bytes]
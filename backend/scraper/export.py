@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+from typing import IO, Iterable, Iterator, Union
+
+from scraper.records import COLUMN_TYPES, COLUMNS, Restaurant
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+MEDIA_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def iter_csv(records: Iterable[Restaurant]) -> Iterator[str]:
+    """Yield a CSV header and then one line per record, nothing is buffered beyond a row."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record.to_row())
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_jsonl(records: Iterable[Restaurant]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record.to_row(), ensure_ascii=False) + '\n'
+
+
+def write_parquet(records: Iterable[Restaurant], path: str, batch_size: int = 1000) -> int:
+    """Write records to a Parquet file one row group per ``batch_size`` records."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow, install it with 'pip install pyarrow'")
+
+    arrow_types = {str: pa.string(), int: pa.int64(), float: pa.float64()}
+    schema = pa.schema([(column, arrow_types[kind]) for column, kind in COLUMN_TYPES.items()])
+    columns = {column: [] for column in COLUMNS}
+    count = 0
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for record in records:
+            row = record.to_row()
+            for column in COLUMNS:
+                columns[column].append(row[column])
+            count += 1
+            if count % batch_size == 0:
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                columns = {column: [] for column in COLUMNS}
+        if columns['place_id']:
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+    return count
+
+
+def export_records(records: Iterable[Restaurant], fmt: str, output: Union[str, IO[str]]) -> int:
+    """Stream records to ``output`` (a path, or a text stream for csv/jsonl) and return how many were written."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of {', '.join(EXPORT_FORMATS)}")
+
+    if fmt == 'parquet':
+        if not isinstance(output, str):
+            raise ValueError("Parquet export needs an output file path")
+        return write_parquet(records, output)
+
+    count = 0
+
+    def counted():
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    chunks = iter_csv(counted()) if fmt == 'csv' else iter_jsonl(counted())
+    if isinstance(output, str):
+        with open(output, 'w', newline='', encoding='utf-8') as stream:
+            stream.writelines(chunks)
+    else:
+        output.writelines(chunks)
+    return count
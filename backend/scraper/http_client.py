@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class RateLimiter:
+    """Token bucket per host, shared between all worker threads."""
+
+    def __init__(self, default_rate: float = 2.0, host_rates: Optional[Dict[str, float]] = None):
+        self.default_rate = default_rate
+        self.host_rates = host_rates or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        host = urlparse(url).netloc.lower()
+        rate = self.host_rates.get(host, self.default_rate)
+        if not rate or rate <= 0:
+            return
+
+        capacity = max(1.0, rate)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (capacity, now))
+                tokens = min(capacity, tokens + (now - last) * rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                delay = (1 - tokens) / rate
+            time.sleep(delay)
+
+
+class HttpClient:
+    """Pooled keep-alive session with per-host rate limiting."""
+
+    def __init__(self, pool_size: int = 10, default_rate: float = 2.0,
+                 host_rates: Optional[Dict[str, float]] = None):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(pool_size, 20), pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.rate_limiter = RateLimiter(default_rate, host_rates)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.rate_limiter.wait(url)
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
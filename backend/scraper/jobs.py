@@ -0,0 +1,279 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+FINISHED_STATUSES = ('completed', 'failed')
+
+
+class JobStore:
+    """SQLite checkpoint store for bulk jobs.
+
+    A place_id is stored once per job however many locations list it, so
+    overlapping towns never fetch the same place twice.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' id TEXT PRIMARY KEY, status TEXT NOT NULL, error TEXT,'
+            ' created_at REAL NOT NULL, updated_at REAL NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS job_locations ('
+            ' job_id TEXT NOT NULL, position INTEGER NOT NULL, location TEXT NOT NULL,'
+            ' status TEXT NOT NULL, errors INTEGER NOT NULL DEFAULT 0, error TEXT,'
+            ' PRIMARY KEY (job_id, position));'
+            'CREATE TABLE IF NOT EXISTS job_location_places ('
+            ' job_id TEXT NOT NULL, position INTEGER NOT NULL, place_id TEXT NOT NULL,'
+            ' PRIMARY KEY (job_id, position, place_id));'
+            'CREATE TABLE IF NOT EXISTS job_places ('
+            ' job_id TEXT NOT NULL, place_id TEXT NOT NULL, status TEXT NOT NULL, record TEXT,'
+            ' PRIMARY KEY (job_id, place_id));'
+        )
+        # Stores created before per-location error counts were tracked
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(job_locations)')}
+        if 'errors' not in columns:
+            self._conn.execute('ALTER TABLE job_locations ADD COLUMN errors INTEGER NOT NULL DEFAULT 0')
+            self._conn.execute('ALTER TABLE job_locations ADD COLUMN error TEXT')
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, locations: List[str]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO jobs (id, status, created_at, updated_at) VALUES (?, ?, ?, ?)',
+                (job_id, 'queued', now, now)
+            )
+            self._conn.executemany(
+                'INSERT INTO job_locations (job_id, position, location, status) VALUES (?, ?, ?, ?)',
+                [(job_id, position, location, 'pending') for position, location in enumerate(locations)]
+            )
+            self._conn.commit()
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?',
+                (status, error, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def unfinished_jobs(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id FROM jobs WHERE status NOT IN (?, ?) ORDER BY created_at', FINISHED_STATUSES
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def pending_locations(self, job_id: str) -> List[Tuple[int, str]]:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT position, location FROM job_locations'
+                ' WHERE job_id = ? AND status = ? ORDER BY position', (job_id, 'pending')
+            ).fetchall()
+
+    def add_location_places(self, job_id: str, position: int, place_ids: List[str]) -> List[str]:
+        """Record a location's places and return the ones not yet claimed by this job."""
+        with self._lock:
+            known = {
+                row[0] for row in self._conn.execute(
+                    'SELECT place_id FROM job_places WHERE job_id = ?', (job_id,)
+                )
+            }
+            new_ids = list(dict.fromkeys(place_id for place_id in place_ids if place_id not in known))
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO job_location_places (job_id, position, place_id) VALUES (?, ?, ?)',
+                [(job_id, position, place_id) for place_id in place_ids]
+            )
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO job_places (job_id, place_id, status) VALUES (?, ?, ?)',
+                [(job_id, place_id, 'pending') for place_id in new_ids]
+            )
+            self._conn.execute(
+                'UPDATE job_locations SET status = ? WHERE job_id = ? AND position = ?',
+                ('searched', job_id, position)
+            )
+            self._conn.commit()
+        return new_ids
+
+    def location_failed(self, job_id: str, position: int, error: str):
+        """Count a failed search, the location stays pending for the next run."""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE job_locations SET errors = errors + 1, error = ? WHERE job_id = ? AND position = ?',
+                (error, job_id, position)
+            )
+            self._conn.commit()
+
+    def pending_places(self, job_id: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT place_id FROM job_places WHERE job_id = ? AND status = ?', (job_id, 'pending')
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def save_place(self, job_id: str, place_id: str, record: Optional[Dict]):
+        with self._lock:
+            self._conn.execute(
+                'UPDATE job_places SET status = ?, record = ? WHERE job_id = ? AND place_id = ?',
+                ('done' if record else 'skipped', json.dumps(record) if record else None, job_id, place_id)
+            )
+            self._conn.commit()
+
+    def progress(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._conn.execute(
+                'SELECT status, error, created_at, updated_at FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            locations = dict(self._conn.execute(
+                'SELECT status, COUNT(*) FROM job_locations WHERE job_id = ? GROUP BY status', (job_id,)
+            ).fetchall())
+            location_errors = self._conn.execute(
+                'SELECT COALESCE(SUM(errors), 0) FROM job_locations WHERE job_id = ?', (job_id,)
+            ).fetchone()[0]
+            places = dict(self._conn.execute(
+                'SELECT status, COUNT(*) FROM job_places WHERE job_id = ? GROUP BY status', (job_id,)
+            ).fetchall())
+
+        return {
+            'job_id': job_id,
+            'status': job[0],
+            'error': job[1],
+            'created_at': job[2],
+            'updated_at': job[3],
+            'locations_total': sum(locations.values()),
+            'locations_searched': locations.get('searched', 0),
+            'location_errors': location_errors,
+            'places_total': sum(places.values()),
+            'places_done': places.get('done', 0) + places.get('skipped', 0),
+        }
+
+    def results(self, job_id: str) -> List[Dict]:
+        with self._lock:
+            locations = self._conn.execute(
+                'SELECT position, location FROM job_locations WHERE job_id = ? ORDER BY position', (job_id,)
+            ).fetchall()
+            rows = self._conn.execute(
+                'SELECT lp.position, p.record FROM job_location_places lp'
+                ' JOIN job_places p ON p.job_id = lp.job_id AND p.place_id = lp.place_id'
+                ' WHERE lp.job_id = ? AND p.status = ?', (job_id, 'done')
+            ).fetchall()
+
+        restaurants = {position: [] for position, _ in locations}
+        for position, record in rows:
+            restaurants[position].append(json.loads(record))
+        return [
+            {'location': location, 'restaurants': restaurants[position]}
+            for position, location in locations
+        ]
+
+
+class JobManager:
+    """Runs bulk multi-location jobs on a local worker pool, checkpointing every place."""
+
+    def __init__(self, scraper, path: str, max_jobs: int = 2, place_workers: int = 8):
+        self.scraper = scraper
+        self.store = JobStore(path)
+        self.job_pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix='bulk-job')
+        self.place_pool = ThreadPoolExecutor(max_workers=place_workers, thread_name_prefix='bulk-place')
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def submit(self, locations: List[str]) -> str:
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, locations)
+        self._start(job_id)
+        return job_id
+
+    def resume(self) -> List[str]:
+        """Restart jobs left unfinished by a previous process."""
+        job_ids = self.store.unfinished_jobs()
+        for job_id in job_ids:
+            self._start(job_id)
+        return job_ids
+
+    def retry(self, job_id: str) -> bool:
+        """Run a failed job again from its checkpoints, only pending locations and places are redone."""
+        progress = self.store.progress(job_id)
+        if progress is None or progress['status'] != 'failed':
+            return False
+        self.store.set_status(job_id, 'queued')
+        self._start(job_id)
+        return True
+
+    def progress(self, job_id: str) -> Optional[Dict]:
+        return self.store.progress(job_id)
+
+    def results(self, job_id: str) -> List[Dict]:
+        return self.store.results(job_id)
+
+    def _start(self, job_id: str):
+        with self._lock:
+            if job_id in self._running:
+                return
+            self._running.add(job_id)
+        self.job_pool.submit(self._run, job_id)
+
+    def _run(self, job_id: str):
+        futures = []
+        errors = []
+
+        def submit_places(place_ids: List[str]):
+            for place_id in place_ids:
+                futures.append(self.place_pool.submit(self._fetch_place, job_id, place_id))
+
+        try:
+            self.store.set_status(job_id, 'running')
+            # Places claimed before a restart are picked up first
+            submit_places(self.store.pending_places(job_id))
+            for position, location in self.store.pending_locations(job_id):
+                try:
+                    # Strict, so a quota or auth error fails the town instead of marking it searched and empty
+                    place_ids = [place['place_id'] for place in self.scraper._iter_places(location, strict=True)]
+                except Exception as e:
+                    # One town failing doesn't stop the others, retrying the job searches it again
+                    print(f"Error searching {location} for job {job_id}: {str(e)}")
+                    self.store.location_failed(job_id, position, str(e))
+                    errors.append(f"{location}: {str(e)}")
+                    continue
+                submit_places(self.store.add_location_places(job_id, position, place_ids))
+        except Exception as e:
+            print(f"Error running job {job_id}: {str(e)}")
+            errors.append(str(e))
+        finally:
+            # Places already submitted keep writing to the job, so it only finishes once they are done
+            wait(futures)
+            with self._lock:
+                self._running.discard(job_id)
+            self._finish(job_id, errors)
+
+    def _finish(self, job_id: str, errors: List[str]):
+        try:
+            unsaved = len(self.store.pending_places(job_id))
+            if unsaved:
+                errors.append(f"{unsaved} places were not saved")
+            if errors:
+                self.store.set_status(job_id, 'failed', '; '.join(errors))
+            else:
+                self.store.set_status(job_id, 'completed')
+        except Exception as e:
+            print(f"Error finishing job {job_id}: {str(e)}")
+
+    def _fetch_place(self, job_id: str, place_id: str):
+        try:
+            record = self.scraper._load_place_record(place_id)
+            # Only a place Google has no result for is skipped, errors leave it pending for a resume
+            self.store.save_place(job_id, place_id, record.to_dict() if record else None)
+        except Exception as e:
+            print(f"Error saving place {place_id} for job {job_id}: {str(e)}")
@@ -0,0 +1,89 @@
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Sequence
+
+logger = logging.getLogger('scraper.metrics')
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def summarise(durations: List[float]) -> Dict[str, float]:
+    ordered = sorted(durations)
+    return {
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 2) if ordered else 0.0,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 2),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 2),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 2),
+        'max_ms': round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+class StageMetrics:
+    """Per-stage timings for the scraping pipeline.
+
+    Counters cover the whole process lifetime, percentiles the most recent
+    ``window`` samples of each stage. Every sample is also logged as a JSON
+    line on the ``scraper.metrics`` logger.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timed(self, stage: str, **fields):
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except Exception:
+            ok = False
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - start, ok, **fields)
+
+    def record(self, stage: str, duration: float, ok: bool = True, **fields):
+        with self._lock:
+            data = self._stages.get(stage)
+            if data is None:
+                data = self._stages[stage] = {
+                    'count': 0, 'errors': 0, 'total': 0.0, 'samples': deque(maxlen=self.window)
+                }
+            data['count'] += 1
+            data['total'] += duration
+            data['samples'].append(duration)
+            if not ok:
+                data['errors'] += 1
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'event': 'stage_timing', 'stage': stage,
+                'duration_ms': round(duration * 1000, 2), 'ok': ok, **fields
+            }))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            stages = {
+                stage: (data['count'], data['errors'], data['total'], list(data['samples']))
+                for stage, data in self._stages.items()
+            }
+        return {
+            stage: {'count': count, 'errors': errors, 'total_seconds': round(total, 3), **summarise(samples)}
+            for stage, (count, errors, total, samples) in stages.items()
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
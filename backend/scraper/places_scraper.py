@@ -1,191 +1,391 @@
-import requests
+import argparse
 import json
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
 import os
-from bs4 import BeautifulSoup
-import re
 import time
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
+import sys
+import queue
+import threading
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+
+sys.path.append(str(Path(__file__).parent.parent))
+from scraper.http_client import HttpClient
+from scraper.cache import REFRESH_WORKERS, PlaceCache, normalise_location
+from scraper.email_extractor import EmailExtractor, site_domain
+from scraper.review_analyzer import ReviewAnalyzer
+from scraper.tiling import TILE_WORKERS, CoverageStats, Tile, TiledSearch
+from scraper.metrics import StageMetrics
+from scraper.records import Restaurant, restaurant_from_details
+from scraper.export import EXPORT_FORMATS, export_records
+
+GOOGLE_API_BASE_URL = "https://maps.googleapis.com"
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / '.cache' / 'places.sqlite3'
+TEXT_SEARCH_PAGE_SIZE = 20
+
+# Place Details fields each enrichment stage needs, 'basic' is always requested and
+# only holds Basic Data fields so a lookup is billed at the Atmosphere rate only
+# when ratings or reviews are asked for
+DETAIL_FIELD_GROUPS = {
+    'basic': ['name', 'formatted_address', 'types'],
+    'ratings': ['price_level', 'rating', 'user_ratings_total'],
+    'contact': ['formatted_phone_number', 'website'],
+    'hours': ['opening_hours'],
+    'reviews': ['reviews'],
+    'email': ['website'],
+}
+DETAIL_GROUP_KEYS = {
+    'basic': ['name', 'address', 'cuisine_type'],
+    'ratings': ['price_level', 'rating', 'total_reviews'],
+    'contact': ['phone', 'website'],
+    'hours': ['opening_hours'],
+    'reviews': ['review_stats'],
+    'email': ['email'],
+}
+# Place Details statuses that mean "no such place" rather than a failed lookup
+DETAILS_NO_RESULT_STATUSES = ('NOT_FOUND', 'ZERO_RESULTS', 'INVALID_REQUEST')
+FULL_DETAIL_FIELDS = 'name,formatted_phone_number,website,formatted_address,opening_hours,price_level,rating,reviews,user_ratings_total,types'
+
+
+class PlacesApiError(Exception):
+    """Google answered with an error status such as OVER_QUERY_LIMIT or REQUEST_DENIED."""
+
 
 class RestaurantScraper:
-    def __init__(self, google_api_key: str):
+    def __init__(self, google_api_key: str, max_workers: int = 8,
+                 places_rate: float = 10.0, website_rate: float = 2.0,
+                 cache_path: Optional[str] = None, api_base_url: str = GOOGLE_API_BASE_URL,
+                 page_token_delay: float = 2.0, caller_threads: int = 8):
         self.google_api_key = google_api_key
-        self.places_endpoint = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        self.details_endpoint = "https://maps.googleapis.com/maps/api/place/details/json"
-        nltk.download('vader_lexicon', quiet=True)
-        self.sia = SentimentIntensityAnalyzer()
+        self.places_endpoint = f"{api_base_url}/maps/api/place/textsearch/json"
+        self.details_endpoint = f"{api_base_url}/maps/api/place/details/json"
+        self.geocode_endpoint = f"{api_base_url}/maps/api/geocode/json"
+        self.page_token_delay = page_token_delay
+        self.metrics = StageMetrics()
+        self.review_analyzer = ReviewAnalyzer()
+        # Places calls share one quota, websites are limited per host. The pool
+        # keeps a connection for every thread that uses the client: detail
+        # workers, tile workers, cache refreshers and the caller's own threads
+        self.http = HttpClient(
+            pool_size=max_workers + TILE_WORKERS + REFRESH_WORKERS + caller_threads,
+            default_rate=website_rate,
+            host_rates={urlparse(api_base_url).netloc: places_rate},
+        )
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='place-details')
+        self.cache = PlaceCache(cache_path or DEFAULT_CACHE_PATH)
+        self.email_extractor = EmailExtractor(self.http)
 
     def search_restaurants(self, location: str) -> List[Dict]:
-        restaurants = []
+        pending = []
         try:
-            # Base search
-            url = f"{self.places_endpoint}?query=restaurants+takeaways+in+{location}&type=restaurant|food|meal_delivery|meal_takeaway&key={self.google_api_key}"
-            next_page_token = None
+            for place in self._iter_places(location):
+                pending.append(self.executor.submit(self._fetch_place, place['place_id']))
             
-            while True:
-                if next_page_token:
-                    search_url = f"{url}&pagetoken={next_page_token}"
-                else:
-                    search_url = url
-                
-                response = requests.get(search_url)
-                results = response.json()
-                
-                if results.get('status') != 'OK':
-                    break
-                
-                for place in results.get('results', []):
-                    restaurant_data = self._get_place_details(place['place_id'])
-                    if restaurant_data:
-                        restaurants.append(restaurant_data)
-                
-                next_page_token = results.get('next_page_token')
-                if not next_page_token:
-                    break
-                    
-                time.sleep(2)  # Required delay between requests
-            
-            return restaurants
+            return [record.to_dict() for record in self._collect_records(pending)]
             
         except Exception as e:
+            for future in pending:
+                future.cancel()
             print(f"Error searching restaurants: {str(e)}")
             return []
 
-    def _get_place_details(self, place_id: str) -> Dict:
+    def search_summary(self, location: str, max_pages: int = 1) -> List[Dict]:
+        """Text Search fields only, no Place Details, website or review work.
+
+        Only ``max_pages`` result pages (20 places each) are fetched, so a cold
+        search is one round trip by default with no next_page_token waits.
+        """
+        return [
+            {
+                'place_id': place['place_id'],
+                'name': place.get('name', ''),
+                'address': place.get('formatted_address', ''),
+                'rating': place.get('rating', 0),
+                'total_reviews': place.get('user_ratings_total', 0),
+                'price_level': '£' * (place.get('price_level', 1) or 1),
+            }
+            for place in self._iter_places(location, max_pages)
+        ]
+
+    def get_place(self, place_id: str, groups: List[str]) -> Optional[Dict]:
+        """Fetch one place running only the requested enrichment groups."""
+        unknown = set(groups) - set(DETAIL_FIELD_GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown field groups: {', '.join(sorted(unknown))}")
+        groups = ['basic'] + [group for group in DETAIL_FIELD_GROUPS if group in groups and group != 'basic']
+        
+        # A cached full record covers any selection, otherwise only the masked fields are billed
+        result = self.cache.get('details', place_id)
+        if result is None:
+            fields = ','.join(dict.fromkeys(field for group in groups for field in DETAIL_FIELD_GROUPS[group]))
+            result = self.cache.get_or_fetch(
+                'details', f"{place_id}:{fields}", lambda: self._fetch_place_details(place_id, fields)
+            )
+        if not result:
+            return None
+        
+        email = ''
+        if 'email' in groups and result.get('website'):
+            email = self._scrape_website_email(result['website'])
+        review_stats = self._review_stats([result.get('reviews', [])])[0] if 'reviews' in groups else {}
+        
+        restaurant_data = self._build_restaurant(place_id, result, email, review_stats).to_dict()
+        return {
+            'place_id': place_id,
+            **{key: restaurant_data[key] for group in groups for key in DETAIL_GROUP_KEYS[group]}
+        }
+
+    def search_restaurants_tiled(self, location: Optional[str] = None, bounds: Optional[Tuple[float, float, float, float]] = None,
+                                 grid_size: int = 3, max_depth: int = 2) -> Dict:
+        """Search a location (or a south, west, north, east box) tile by tile to get past the 60 result cap."""
+        area = Tile(*bounds) if bounds else self._geocode_area(location)
+        if area is None:
+            return {'restaurants': [], 'coverage': CoverageStats().to_dict()}
+        
+        places, coverage = TiledSearch(self, grid_size=grid_size, max_depth=max_depth).search(area)
+        pending = [self.executor.submit(self._fetch_place, place['place_id']) for place in places]
+        try:
+            records = self._collect_records(pending)
+        except Exception:
+            for future in pending:
+                future.cancel()
+            raise
+        return {'restaurants': [record.to_dict() for record in records], 'coverage': coverage.to_dict()}
+
+    def _collect_records(self, pending: List[Future]) -> List[Restaurant]:
+        fetched = [future.result() for future in pending]
+        fetched = [place for place in fetched if place]
+        # Reviews for the whole search are scored as one batch
+        review_stats = self._review_stats([result.get('reviews', []) for _, result, _ in fetched])
+        return [
+            self._build_restaurant(place_id, result, email, stats)
+            for (place_id, result, email), stats in zip(fetched, review_stats)
+        ]
+
+    def iter_restaurants(self, location: str, cancelled: Optional[threading.Event] = None) -> Iterator[Dict]:
+        """Yield restaurants as soon as each one is enriched, in completion order.
+
+        Setting ``cancelled`` (or closing the generator) stops paging and
+        cancels detail lookups that have not started yet.
+        """
+        for record in self.iter_records(location, cancelled):
+            yield record.to_dict()
+
+    def iter_location_records(self, locations: List[str]) -> Iterator[Restaurant]:
+        """Records for several locations, skipping places an earlier location already produced."""
+        seen = set()
+        for location in locations:
+            for record in self.iter_records(location):
+                if record.place_id not in seen:
+                    seen.add(record.place_id)
+                    yield record
+
+    def iter_records(self, location: str, cancelled: Optional[threading.Event] = None) -> Iterator[Restaurant]:
+        """Typed variant of iter_restaurants, used by the exporters."""
+        stop = cancelled or threading.Event()
+        completed = queue.Queue()
+        futures = []
+
+        def submit_places():
+            try:
+                for place in self._iter_places(location):
+                    if stop.is_set():
+                        break
+                    future = self.executor.submit(self._get_place_record, place['place_id'])
+                    futures.append(future)
+                    future.add_done_callback(completed.put)
+            except Exception as e:
+                print(f"Error searching restaurants: {str(e)}")
+            finally:
+                completed.put(None)
+
+        threading.Thread(target=submit_places, name='place-search', daemon=True).start()
+        listing_done = False
+        received = 0
         try:
-            url = f"{self.details_endpoint}?place_id={place_id}&fields=name,formatted_phone_number,website,formatted_address,opening_hours,price_level,rating,reviews,user_ratings_total,types&key={self.google_api_key}"
-            response = requests.get(url)
-            result = response.json().get('result', {})
+            while not listing_done or received < len(futures):
+                if stop.is_set():
+                    break
+                try:
+                    future = completed.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if future is None:
+                    listing_done = True
+                    continue
+                
+                received += 1
+                if future.cancelled():
+                    continue
+                record = future.result()
+                if record:
+                    yield record
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+
+    def _iter_places(self, location: str, max_pages: Optional[int] = None, strict: bool = False) -> Iterator[Dict]:
+        cache_key = normalise_location(location)
+        cached = self.cache.get('search', cache_key, refresh=lambda: self._search_places(location))
+        if cached is None and max_pages:
+            # Partial listings get their own key so full searches never see them
+            cache_key = f"{cache_key}|pages={max_pages}"
+            cached = self.cache.get('search', cache_key, refresh=lambda: self._search_places(location, max_pages))
+        if cached is not None:
+            yield from cached[:max_pages * TEXT_SEARCH_PAGE_SIZE] if max_pages else cached
+            return
+        
+        found = []
+        for place in self._iter_search_places(location, max_pages, strict):
+            found.append(place)
+            yield place
+        
+        if found:
+            self.cache.set('search', cache_key, found)
+
+    def _iter_search_places(self, location: str, max_pages: Optional[int] = None, strict: bool = False) -> Iterator[Dict]:
+        yield from self._iter_text_search(f"query=restaurants+takeaways+in+{location}", max_pages, strict)
+
+    def _iter_area_places(self, center: Tuple[float, float], radius: int) -> Iterator[Dict]:
+        lat, lng = center
+        yield from self._iter_text_search(f"query=restaurants+takeaways&location={lat},{lng}&radius={radius}")
+
+    def _iter_text_search(self, query: str, max_pages: Optional[int] = None, strict: bool = False) -> Iterator[Dict]:
+        """Yield Text Search results page by page. Any status other than OK ends the
+        search, with ``strict`` the error ones (all but ZERO_RESULTS) raise instead."""
+        # Base search
+        url = f"{self.places_endpoint}?{query}&type=restaurant|food|meal_delivery|meal_takeaway&key={self.google_api_key}"
+        next_page_token = None
+        pages = 0
+        
+        while True:
+            if next_page_token:
+                search_url = f"{url}&pagetoken={next_page_token}"
+            else:
+                search_url = url
             
-            if not result:
-                return None
-
-            restaurant_data = {
-                'name': result.get('name', ''),
-                'phone': result.get('formatted_phone_number', ''),
-                'website': result.get('website', ''),
-                'address': result.get('formatted_address', ''),
-                'cuisine_type': self._extract_cuisine_type(result.get('types', [])),
-                'price_level': '£' * (result.get('price_level', 1) or 1),
-                'rating': result.get('rating', 0),
-                'total_reviews': result.get('user_ratings_total', 0),
-                'opening_hours': result.get('opening_hours', {}).get('weekday_text', []),
-                'review_stats': self._analyze_reviews(result.get('reviews', [])),
-                'email': ''
-            }
+            with self.metrics.timed('search_page'):
+                response = self.http.get(search_url, timeout=10)
+                results = response.json()
             
-            # Try to find email if website exists
-            if restaurant_data['website']:
-                restaurant_data['email'] = self._scrape_website_email(restaurant_data['website'])
+            status = results.get('status')
+            if status != 'OK':
+                if strict and status != 'ZERO_RESULTS':
+                    raise PlacesApiError(f"Text Search failed: {status}")
+                break
             
-            return restaurant_data
+            yield from results.get('results', [])
+            pages += 1
             
+            next_page_token = results.get('next_page_token')
+            if not next_page_token or pages == max_pages:
+                break
+                
+            time.sleep(self.page_token_delay)  # Required delay between requests, details already yielded keep running
+
+    def _geocode_area(self, location: str) -> Optional[Tile]:
+        url = f"{self.geocode_endpoint}?address={location}&key={self.google_api_key}"
+        results = self.http.get(url, timeout=10).json().get('results', [])
+        if not results:
+            return None
+        geometry = results[0].get('geometry', {})
+        box = geometry.get('bounds') or geometry.get('viewport')
+        if not box:
+            return None
+        return Tile(box['southwest']['lat'], box['southwest']['lng'], box['northeast']['lat'], box['northeast']['lng'])
+
+    def _search_places(self, location: str, max_pages: Optional[int] = None) -> Optional[List[Dict]]:
+        return list(self._iter_search_places(location, max_pages)) or None
+
+    def _get_place_details(self, place_id: str) -> Dict:
+        record = self._get_place_record(place_id)
+        return record.to_dict() if record else None
+
+    def _get_place_record(self, place_id: str) -> Optional[Restaurant]:
+        try:
+            return self._load_place_record(place_id)
         except Exception as e:
             print(f"Error getting place details: {str(e)}")
             return None
 
-    def _extract_cuisine_type(self, types: List[str]) -> str:
-        cuisine_keywords = {
-            'restaurant': ['restaurant', 'dining'],
-            'takeaway': ['takeaway', 'take_away', 'meal_delivery', 'meal_takeaway'],
-            'indian': ['indian'],
-            'chinese': ['chinese'],
-            'pizza': ['pizza'],
-            'fish_and_chips': ['fish_and_chips', 'fish'],
-            'kebab': ['kebab'],
-            'burger': ['burger'],
-            'thai': ['thai'],
-            'japanese': ['japanese', 'sushi'],
-            'italian': ['italian'],
-            'pub_food': ['pub', 'bar'],
-            'cafe': ['cafe', 'coffee'],
-            'chicken': ['chicken', 'peri']
-        }
-        
-        found_types = []
-        for cuisine, keywords in cuisine_keywords.items():
-            if any(keyword in str(types).lower() for keyword in keywords):
-                found_types.append(cuisine.replace('_', ' ').title())
-        
-        return ' & '.join(found_types) if found_types else 'Restaurant/Takeaway'
-
-    def _analyze_reviews(self, reviews: List[Dict]) -> Dict:
-        if not reviews:
-            return {
-                'average_sentiment': 0,
-                'recent_reviews': [],
-                'keyword_mentions': {}
-            }
-        
-        sentiments = []
-        recent_reviews = []
-        keyword_mentions = {
-            'food': 0,
-            'service': 0,
-            'price': 0,
-            'delivery': 0,
-            'cleanliness': 0
-        }
+    def _load_place_record(self, place_id: str) -> Optional[Restaurant]:
+        """Like _get_place_record but lookup errors raise, None means Google has no such place."""
+        place = self._load_place(place_id)
+        if not place:
+            return None
+        _, result, email = place
+        return self._build_restaurant(place_id, result, email, self._review_stats([result.get('reviews', [])])[0])
+
+    def _fetch_place(self, place_id: str) -> Optional[Tuple[str, Dict, str]]:
+        try:
+            return self._load_place(place_id)
+        except Exception as e:
+            print(f"Error getting place details: {str(e)}")
+            return None
+
+    def _load_place(self, place_id: str) -> Optional[Tuple[str, Dict, str]]:
+        result = self.cache.get_or_fetch('details', place_id, lambda: self._fetch_place_details(place_id))
         
-        keywords = {
-            'food': ['food', 'meal', 'dish', 'taste', 'menu'],
-            'service': ['service', 'staff', 'waiter', 'waitress'],
-            'price': ['price', 'value', 'expensive', 'cheap'],
-            'delivery': ['delivery', 'deliveroo', 'uber', 'just eat'],
-            'cleanliness': ['clean', 'dirty', 'hygiene']
-        }
+        if not result:
+            return None
         
-        for review in reviews:
-            sentiment = self.sia.polarity_scores(review['text'])
-            sentiments.append(sentiment['compound'])
-            
-            text = review['text'].lower()
-            for category, words in keywords.items():
-                if any(word in text for word in words):
-                    keyword_mentions[category] += 1
-            
-            recent_reviews.append({
-                'text': review['text'][:200] + '...' if len(review['text']) > 200 else review['text'],
-                'rating': review.get('rating', 0),
-                'time': review.get('time', ''),
-                'sentiment': sentiment['compound']
-            })
+        # Try to find email if website exists
+        email = ''
+        if result.get('website'):
+            email = self._scrape_website_email(result['website'])
         
-        return {
-            'average_sentiment': sum(sentiments) / len(sentiments) if sentiments else 0,
-            'recent_reviews': sorted(recent_reviews, key=lambda x: x.get('time', 0), reverse=True)[:3],
-            'keyword_mentions': keyword_mentions
-        }
+        return place_id, result, email
+
+    def _build_restaurant(self, place_id: str, result: Dict, email: str, review_stats: Dict) -> Restaurant:
+        cuisine_type = self.review_analyzer.cuisine_type(result.get('types', []))
+        return restaurant_from_details(place_id, result, email, review_stats, cuisine_type)
+
+    def _fetch_place_details(self, place_id: str, fields: str = FULL_DETAIL_FIELDS) -> Optional[Dict]:
+        url = f"{self.details_endpoint}?place_id={place_id}&fields={fields}&key={self.google_api_key}"
+        with self.metrics.timed('details'):
+            response = self.http.get(url, timeout=10)
+            data = response.json()
+        # Quota and auth errors raise so they are never mistaken for a missing place
+        if data.get('status', 'OK') not in DETAILS_NO_RESULT_STATUSES + ('OK',):
+            raise PlacesApiError(f"Place Details failed for {place_id}: {data.get('status')}")
+        return data.get('result') or None
 
     def _scrape_website_email(self, url: str) -> str:
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Look for email in text
-            email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-            emails = re.findall(email_pattern, str(soup))
-            
-            # Filter out common false positives
-            valid_emails = [
-                email for email in emails
-                if not any(exclude in email.lower()
-                    for exclude in ['example', 'domain', 'email', '@your', '@site'])
-            ]
-            
-            return valid_emails[0] if valid_emails else ''
+            # Chains share a website, so emails are cached per domain
+            domain = site_domain(url)
+            return self.cache.get_or_fetch('email', domain or url, lambda: self._extract_email(url))
             
         except Exception as e:
             print(f"Error scraping website: {str(e)}")
             return ''
 
+    def _extract_email(self, url: str) -> str:
+        with self.metrics.timed('website'):
+            return self.email_extractor.extract(url)
+
+    def _review_stats(self, review_lists: List[List[Dict]]) -> List[Dict]:
+        with self.metrics.timed('sentiment', places=len(review_lists)):
+            return self.review_analyzer.analyze_many(review_lists)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search restaurants and print or export them")
+    parser.add_argument('locations', nargs='*', default=["Romford"])
+    parser.add_argument('--format', choices=('json',) + EXPORT_FORMATS, default='json',
+                        help="json prints the API response, the others stream flat rows")
+    parser.add_argument('--output', help="file to write to, defaults to stdout (required for parquet)")
+    args = parser.parse_args()
+    if args.format == 'parquet' and not args.output:
+        parser.error("--output is required for parquet")
+
     api_key = os.getenv('GOOGLE_PLACES_API_KEY')
     scraper = RestaurantScraper(api_key)
     
-    results = scraper.search_restaurants("Romford")
-    print(json.dumps(results, indent=2))
\ No newline at end of file
+    if args.format == 'json':
+        results = [restaurant for location in args.locations for restaurant in scraper.search_restaurants(location)]
+        print(json.dumps(results, indent=2))
+    else:
+        count = export_records(scraper.iter_location_records(args.locations), args.format, args.output or sys.stdout)
+        print(f"Exported {count} restaurants", file=sys.stderr)
\ No newline at end of file
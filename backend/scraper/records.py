@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+KEYWORD_CATEGORIES = ('food', 'service', 'price', 'delivery', 'cleanliness')
+RECENT_REVIEW_COLUMNS = 3
+
+# Flat export columns and their types, in output order
+COLUMN_TYPES = {
+    'place_id': str,
+    'name': str,
+    'email': str,
+    'phone': str,
+    'website': str,
+    'address': str,
+    'cuisine_type': str,
+    'price_level': str,
+    'rating': float,
+    'total_reviews': int,
+    **{f'hours_{day}': str for day in WEEKDAYS},
+    'average_sentiment': float,
+    **{f'mentions_{category}': int for category in KEYWORD_CATEGORIES},
+    **{
+        f'review_{index}_{field}': kind
+        for index in range(1, RECENT_REVIEW_COLUMNS + 1)
+        for field, kind in (('text', str), ('rating', int), ('sentiment', float))
+    },
+}
+COLUMNS = list(COLUMN_TYPES)
+
+
+@dataclass(slots=True)
+class Restaurant:
+    place_id: str
+    name: str
+    phone: str
+    website: str
+    address: str
+    cuisine_type: str
+    price_level: str
+    rating: float
+    total_reviews: int
+    opening_hours: Tuple[str, ...]
+    review_stats: Dict
+    email: str
+
+    def to_dict(self) -> Dict:
+        """The nested shape returned by the search endpoints."""
+        return {
+            'name': self.name,
+            'phone': self.phone,
+            'website': self.website,
+            'address': self.address,
+            'cuisine_type': self.cuisine_type,
+            'price_level': self.price_level,
+            'rating': self.rating,
+            'total_reviews': self.total_reviews,
+            'opening_hours': list(self.opening_hours),
+            'review_stats': self.review_stats,
+            'email': self.email
+        }
+
+    def to_row(self) -> Dict:
+        """One flat row with opening hours and review stats spread over columns."""
+        row = {
+            'place_id': self.place_id,
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'website': self.website,
+            'address': self.address,
+            'cuisine_type': self.cuisine_type,
+            'price_level': self.price_level,
+            'rating': self.rating,
+            'total_reviews': self.total_reviews,
+            'average_sentiment': self.review_stats.get('average_sentiment', 0),
+        }
+        row.update(_hours_columns(self.opening_hours))
+
+        mentions = self.review_stats.get('keyword_mentions', {})
+        for category in KEYWORD_CATEGORIES:
+            row[f'mentions_{category}'] = mentions.get(category, 0)
+
+        reviews = self.review_stats.get('recent_reviews', [])
+        for index in range(1, RECENT_REVIEW_COLUMNS + 1):
+            review = reviews[index - 1] if index <= len(reviews) else {}
+            row[f'review_{index}_text'] = review.get('text')
+            row[f'review_{index}_rating'] = review.get('rating')
+            row[f'review_{index}_sentiment'] = review.get('sentiment')
+        return row
+
+
+def _hours_columns(opening_hours: Tuple[str, ...]) -> Dict[str, str]:
+    # weekday_text entries look like "Monday: 11:00 AM – 10:00 PM"
+    columns = {f'hours_{day}': '' for day in WEEKDAYS}
+    for line in opening_hours:
+        day, _, hours = line.partition(':')
+        key = f'hours_{day.strip().lower()}'
+        if key in columns:
+            columns[key] = hours.strip()
+    return columns
+
+
+def restaurant_from_details(place_id: str, result: Dict, email: str, review_stats: Dict, cuisine_type: str) -> Restaurant:
+    return Restaurant(
+        place_id=place_id,
+        name=result.get('name', ''),
+        phone=result.get('formatted_phone_number', ''),
+        website=result.get('website', ''),
+        address=result.get('formatted_address', ''),
+        cuisine_type=cuisine_type,
+        price_level='£' * (result.get('price_level', 1) or 1),
+        rating=result.get('rating', 0),
+        total_reviews=result.get('user_ratings_total', 0),
+        opening_hours=tuple(result.get('opening_hours', {}).get('weekday_text', [])),
+        review_stats=review_stats,
+        email=email,
+    )
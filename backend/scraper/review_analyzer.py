@@ -0,0 +1,193 @@
+import hashlib
+import multiprocessing
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Sequence
+
+import nltk
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+CUISINE_KEYWORDS = {
+    'restaurant': ['restaurant', 'dining'],
+    'takeaway': ['takeaway', 'take_away', 'meal_delivery', 'meal_takeaway'],
+    'indian': ['indian'],
+    'chinese': ['chinese'],
+    'pizza': ['pizza'],
+    'fish_and_chips': ['fish_and_chips', 'fish'],
+    'kebab': ['kebab'],
+    'burger': ['burger'],
+    'thai': ['thai'],
+    'japanese': ['japanese', 'sushi'],
+    'italian': ['italian'],
+    'pub_food': ['pub', 'bar'],
+    'cafe': ['cafe', 'coffee'],
+    'chicken': ['chicken', 'peri']
+}
+
+REVIEW_KEYWORDS = {
+    'food': ['food', 'meal', 'dish', 'taste', 'menu'],
+    'service': ['service', 'staff', 'waiter', 'waitress'],
+    'price': ['price', 'value', 'expensive', 'cheap'],
+    'delivery': ['delivery', 'deliveroo', 'uber', 'just eat'],
+    'cleanliness': ['clean', 'dirty', 'hygiene']
+}
+
+
+def build_matcher(table: Dict[str, List[str]]) -> Pattern:
+    """Compile a keyword table into one regex that reports every category in a single pass.
+
+    Each category is a named group inside a lookahead, so overlapping
+    keywords are all found and ``match.lastgroup`` names the category.
+    """
+    groups = [
+        f"(?P<c{index}>{'|'.join(re.escape(word) for word in words)})"
+        for index, words in enumerate(table.values())
+    ]
+    return re.compile('(?=' + '|'.join(groups) + ')')
+
+
+def match_categories(matcher: Pattern, categories: Sequence[str], text: str) -> List[str]:
+    hits = {int(match.lastgroup[1:]) for match in matcher.finditer(text)}
+    return [categories[index] for index in sorted(hits)]
+
+
+CUISINE_MATCHER = build_matcher(CUISINE_KEYWORDS)
+CUISINE_CATEGORIES = list(CUISINE_KEYWORDS)
+REVIEW_MATCHER = build_matcher(REVIEW_KEYWORDS)
+REVIEW_CATEGORIES = list(REVIEW_KEYWORDS)
+
+_worker_sia = None
+
+
+def _init_worker():
+    global _worker_sia
+    nltk.download('vader_lexicon', quiet=True)
+    _worker_sia = SentimentIntensityAnalyzer()
+
+
+def _score_texts(texts: List[str]) -> List[float]:
+    return [_worker_sia.polarity_scores(text)['compound'] for text in texts]
+
+
+@lru_cache(maxsize=4096)
+def _cuisine_type(types: tuple) -> str:
+    found_types = [
+        cuisine.replace('_', ' ').title()
+        for cuisine in match_categories(CUISINE_MATCHER, CUISINE_CATEGORIES, str(list(types)).lower())
+    ]
+    return ' & '.join(found_types) if found_types else 'Restaurant/Takeaway'
+
+
+class ReviewAnalyzer:
+    """Sentiment and keyword analysis for Place Details reviews.
+
+    Sentiment is memoized by review-text hash, so re-fetched reviews are never
+    scored twice, and large batches are scored in a process pool.
+    """
+
+    def __init__(self, memo_size: int = 100000, process_threshold: int = 500,
+                 processes: Optional[int] = None, chunk_size: int = 200):
+        nltk.download('vader_lexicon', quiet=True)
+        self.sia = SentimentIntensityAnalyzer()
+        self.memo_size = memo_size
+        self.process_threshold = process_threshold
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def cuisine_type(self, types: List[str]) -> str:
+        return _cuisine_type(tuple(types))
+
+    def analyze(self, reviews: List[Dict]) -> Dict:
+        return self.analyze_many([reviews])[0]
+
+    def analyze_many(self, review_lists: List[List[Dict]]) -> List[Dict]:
+        """Build review_stats for many places, scoring all their reviews as one batch."""
+        texts = {
+            review.get('text', '')
+            for reviews in review_lists if reviews
+            for review in reviews
+        }
+        sentiments = self._sentiments(texts)
+        return [self._review_stats(reviews, sentiments) for reviews in review_lists]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def _sentiments(self, texts) -> Dict[str, float]:
+        keyed = {text: hashlib.sha1(text.encode('utf-8')).digest() for text in texts}
+        sentiments = {}
+        missing = []
+        with self._lock:
+            for text, key in keyed.items():
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                    sentiments[text] = self._memo[key]
+                else:
+                    missing.append(text)
+
+        if not missing:
+            return sentiments
+
+        if len(missing) >= self.process_threshold:
+            chunks = [missing[i:i + self.chunk_size] for i in range(0, len(missing), self.chunk_size)]
+            scores = [score for chunk in self._process_pool().map(_score_texts, chunks) for score in chunk]
+        else:
+            scores = [self.sia.polarity_scores(text)['compound'] for text in missing]
+
+        with self._lock:
+            for text, score in zip(missing, scores):
+                sentiments[text] = score
+                self._memo[keyed[text]] = score
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return sentiments
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _review_stats(self, reviews: List[Dict], sentiments: Dict[str, float]) -> Dict:
+        if not reviews:
+            return {
+                'average_sentiment': 0,
+                'recent_reviews': [],
+                'keyword_mentions': {}
+            }
+
+        scores = []
+        recent_reviews = []
+        keyword_mentions = {category: 0 for category in REVIEW_CATEGORIES}
+
+        for review in reviews:
+            text = review.get('text', '')
+            sentiment = sentiments[text]
+            scores.append(sentiment)
+
+            for category in match_categories(REVIEW_MATCHER, REVIEW_CATEGORIES, text.lower()):
+                keyword_mentions[category] += 1
+
+            recent_reviews.append({
+                'text': text[:200] + '...' if len(text) > 200 else text,
+                'rating': review.get('rating', 0),
+                'time': review.get('time', ''),
+                'sentiment': sentiment
+            })
+
+        return {
+            'average_sentiment': sum(scores) / len(scores),
+            'recent_reviews': sorted(recent_reviews, key=lambda x: x.get('time', 0), reverse=True)[:3],
+            'keyword_mentions': keyword_mentions
+        }
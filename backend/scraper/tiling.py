@@ -0,0 +1,115 @@
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Tuple
+
+# Text Search stops after three pages of 20
+RESULT_CAP = 60
+MAX_RADIUS_M = 50000
+EARTH_RADIUS_M = 6371000
+TILE_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class Tile:
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def radius(self) -> int:
+        """Half the tile diagonal in metres, enough for a circle covering the tile."""
+        lat1, lng1, lat2, lng2 = map(math.radians, (self.south, self.west, self.north, self.east))
+        a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+        diagonal = 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+        return min(MAX_RADIUS_M, max(1, math.ceil(diagonal / 2)))
+
+    def contains(self, lat: float, lng: float) -> bool:
+        return self.south <= lat <= self.north and self.west <= lng <= self.east
+
+    def grid(self, size: int) -> List['Tile']:
+        lat_step = (self.north - self.south) / size
+        lng_step = (self.east - self.west) / size
+        return [
+            Tile(
+                self.south + row * lat_step, self.west + col * lng_step,
+                self.south + (row + 1) * lat_step, self.west + (col + 1) * lng_step,
+                self.depth + 1,
+            )
+            for row in range(size) for col in range(size)
+        ]
+
+
+@dataclass
+class CoverageStats:
+    tiles_searched: int = 0
+    tiles_saturated: int = 0
+    tiles_truncated: int = 0
+    max_depth: int = 0
+    results_seen: int = 0
+    unique_places: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class TiledSearch:
+    """Splits an area into tiles and searches them concurrently.
+
+    Tiles that come back with a full 60 results are quartered, at most
+    ``max_depth`` times; saturated tiles past that are reported as truncated.
+    Places are de-duplicated by place_id across all tiles.
+    """
+
+    def __init__(self, scraper, grid_size: int = 3, max_depth: int = 2, workers: int = TILE_WORKERS):
+        if grid_size < 1 or max_depth < 0:
+            raise ValueError("grid_size must be at least 1 and max_depth at least 0")
+        self.scraper = scraper
+        self.grid_size = grid_size
+        self.max_depth = max_depth
+        self.workers = workers
+
+    def search(self, area: Tile) -> Tuple[List[Dict], CoverageStats]:
+        stats = CoverageStats()
+        places = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tile-search') as pool:
+            pending = {pool.submit(self._search_tile, tile): tile for tile in area.grid(self.grid_size)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tile = pending.pop(future)
+                    results = future.result()
+                    stats.tiles_searched += 1
+                    stats.results_seen += len(results)
+                    stats.max_depth = max(stats.max_depth, tile.depth - 1)
+
+                    for place in results:
+                        location = place.get('geometry', {}).get('location', {})
+                        if 'lat' in location and not tile.contains(location['lat'], location['lng']):
+                            continue
+                        places.setdefault(place['place_id'], place)
+
+                    if len(results) >= RESULT_CAP:
+                        stats.tiles_saturated += 1
+                        if tile.depth <= self.max_depth:
+                            for child in tile.grid(2):
+                                pending[pool.submit(self._search_tile, child)] = child
+                        else:
+                            stats.tiles_truncated += 1
+
+        stats.unique_places = len(places)
+        return list(places.values()), stats
+
+    def _search_tile(self, tile: Tile) -> List[Dict]:
+        try:
+            return list(self.scraper._iter_area_places(tile.center, tile.radius))
+        except Exception as e:
+            print(f"Error searching tile {tile}: {str(e)}")
+            return []
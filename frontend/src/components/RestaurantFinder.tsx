@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import { Search, Download, Star, Clock, ThumbsUp, Mail, Phone, Globe, MapPin, Moon, Sun } from 'lucide-react';
 
 const DarkModeToggle = () => {
@@ -114,6 +114,7 @@ const RestaurantFinder = () => {
   const [isLoading, setIsLoading] = useState(false);
   const [results, setResults] = useState([]);
   const [error, setError] = useState('');
+  const searchController = useRef<AbortController | null>(null);
 
   const handleSearch = async () => {
     if (!location.trim()) {
@@ -121,20 +122,47 @@ const RestaurantFinder = () => {
       return;
     }
 
+    // Stop the previous stream so its rows don't land in the new results
+    searchController.current?.abort();
+    const controller = new AbortController();
+    searchController.current = controller;
+
     setIsLoading(true);
     setError('');
-    
+    setResults([]);
+
     try {
-      const response = await fetch(`http://localhost:8000/api/restaurants?location=${encodeURIComponent(location)}`);
-      if (!response.ok) {
+      const response = await fetch(
+        `http://localhost:8000/api/restaurants/stream?location=${encodeURIComponent(location)}`,
+        { signal: controller.signal }
+      );
+      if (!response.ok || !response.body) {
         throw new Error('Failed to fetch data');
       }
-      const data = await response.json();
-      setResults(data);
+
+      // Restaurants arrive as newline-delimited JSON, show each one as it lands
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done || controller.signal.aborted) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop() || '';
+        const restaurants = lines.filter(line => line.trim()).map(line => JSON.parse(line));
+        if (restaurants.length > 0) {
+          setResults(prev => [...prev, ...restaurants]);
+        }
+      }
     } catch (err) {
-      setError('Failed to fetch restaurant data. Please try again.');
+      if (!controller.signal.aborted) {
+        setError('Failed to fetch restaurant data. Please try again.');
+      }
     } finally {
-      setIsLoading(false);
+      if (searchController.current === controller) {
+        setIsLoading(false);
+      }
     }
   };
 
@@ -182,7 +210,7 @@ const RestaurantFinder = () => {
               onChange={(e) => setLocation(e.target.value)}
               placeholder="Enter town or city name..."
               className="flex-1 p-2 border rounded-lg dark:bg-gray-700 dark:border-gray-600 dark:text-white dark:placeholder-gray-400"
-              onKeyPress={(e) => e.key === 'Enter' && handleSearch()}
+              onKeyPress={(e) => e.key === 'Enter' && !isLoading && handleSearch()}
             />
             <button
               onClick={handleSearch}